@@ -21,7 +21,7 @@ from config import (
     CLUSTER_PERSONAS_DIR,
     CLUSTER_PERSONA_PROMPT,
 )
-from utils import LLMClient, load_json, write_json, read_file_safe, Logger
+from utils import EXIT_INTERRUPTED, ExtractionInterrupted, LLMClient, load_json, write_json, read_file_safe, Logger
 from models import ClusterPersona
 
 
@@ -203,7 +203,7 @@ def save_cluster_persona(
     return output_path
 
 
-def main():
+def main(argv: list = None):
     parser = argparse.ArgumentParser(
         description="Generate cluster personas from user profiles"
     )
@@ -226,7 +226,7 @@ def main():
     )
 
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     log = Logger("extract_personas")
     log.header("Cluster Proto-Persona Generation")
@@ -278,17 +278,16 @@ def main():
     processed = 0
     current = 0
     extraction_times = []
+    interrupted = False
     start_time = time.time()
 
+    # Build every prompt up front so the requests can run concurrently
+    jobs = []
     for month, clusters in grouped.items():
         for cluster_id, cluster_sessions in clusters.items():
             if not args.force and is_already_processed(month, cluster_id):
                 continue
 
-            current += 1
-            # Use Cluster ID in progress bar to avoid long names
-            log.progress(current, to_process, f"{month[:7]} Cluster {cluster_id}")
-
             try:
                 meta = cluster_meta.get(cluster_id, {})
                 profiles, _ = aggregate_user_profiles(cluster_sessions)
@@ -307,29 +306,7 @@ def main():
                 prompt = prompt.replace("{user_profiles}", user_profiles_text)
                 prompt = prompt.replace("{user_count}", str(user_count))
 
-                cluster_start = time.time()
-                # Extract persona
-                persona = client.extract(prompt, ClusterPersona)
-                elapsed = time.time() - cluster_start
-                extraction_times.append(elapsed)
-
-                save_cluster_persona(
-                    month=month,
-                    cluster_id=cluster_id,
-                    cluster_name=meta.get("name", f"Cluster {cluster_id}"),
-                    user_count=user_count,
-                    persona=persona,
-                    source_users=profiles,
-                )
-
-                # Show full name in detail log
-                log.detail(f"  → {cluster_name}", f"{elapsed:.1f}s")
-                processed += 1
-
-            except KeyboardInterrupt:
-                print()
-                log.warning("Interrupted! Run again to resume.")
-                break
+                jobs.append((month, cluster_id, cluster_name, profiles, prompt))
 
             except Exception as e:
                 errors.append(
@@ -337,6 +314,50 @@ def main():
                 )
                 log.error(f"Cluster {cluster_id}: {e}")
 
+    def handle_result(index: int, persona, elapsed: float):
+        """Save one finished persona as soon as it arrives (keeps runs resumable)."""
+        nonlocal processed, current
+        month, cluster_id, cluster_name, profiles, _ = jobs[index]
+        current += 1
+        # Use Cluster ID in progress bar to avoid long names
+        log.progress(current, len(jobs), f"{month[:7]} Cluster {cluster_id}")
+
+        try:
+            if isinstance(persona, Exception):
+                raise persona
+
+            extraction_times.append(elapsed)
+            save_cluster_persona(
+                month=month,
+                cluster_id=cluster_id,
+                cluster_name=cluster_name,
+                user_count=len(profiles),
+                persona=persona,
+                source_users=profiles,
+            )
+
+            # Show full name in detail log; progress redraws are throttled, so
+            # it also carries the month
+            log.detail(f"  → {month[:7]} {cluster_name}", f"{elapsed:.1f}s")
+            processed += 1
+
+        except Exception as e:
+            errors.append(
+                {"month": month, "cluster_id": cluster_id, "error": str(e)}
+            )
+            log.error(f"Cluster {cluster_id}: {e}")
+
+    # One continuous pool of concurrent requests; unfinished clusters are
+    # retried on the next run
+    try:
+        client.extract_many(
+            [prompt for *_, prompt in jobs], ClusterPersona, on_result=handle_result
+        )
+    except ExtractionInterrupted:
+        print()
+        log.warning("Interrupted! Finished personas saved; in-flight requests abandoned. Run again to resume.")
+        interrupted = True
+
     # Summary
     if errors:
         error_log = CLUSTER_PERSONAS_DIR / "persona_extraction_errors.json"
@@ -348,6 +369,8 @@ def main():
     log.summary(processed=processed, skipped=already_done, errors=len(errors))
     log.info(f"Total time: {total_time:.1f}s (avg {avg_time:.1f}s/cluster)")
 
+    return EXIT_INTERRUPTED if interrupted else 0
+
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -14,7 +14,7 @@ from pathlib import Path
 import pandas as pd
 
 from config import DATA_DIR, USERS_DIR, USER_PROFILE_PROMPT
-from utils import LLMClient, read_file_safe, write_json, Logger
+from utils import EXIT_INTERRUPTED, ExtractionInterrupted, LLMClient, read_file_safe, write_json, Logger
 from models import UserProfile
 
 
@@ -47,6 +47,11 @@ def load_users(log: Logger) -> pd.DataFrame:
     return df
 
 
+def build_prompt(base_prompt: str, transcript: str) -> str:
+    """Append an interview transcript to the extraction prompt."""
+    return f"{base_prompt}\n\n--- TRANSCRIPT ---\n{transcript}\n--- END TRANSCRIPT ---"
+
+
 def get_output_path(user_id: str) -> Path:
     """Get the output file path for a user."""
     return USERS_DIR / f"{user_id}.json"
@@ -69,7 +74,7 @@ def save_user_profile(user_id: str, profile: UserProfile):
     write_json(get_output_path(user_id), output)
 
 
-def main():
+def main(argv: list = None):
     parser = argparse.ArgumentParser(
         description="Extract user profiles from interview transcripts"
     )
@@ -79,7 +84,7 @@ def main():
         default="ollama",
         help="LLM provider to use (default: ollama)",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     log = Logger("extract_users")
     log.header("User Profile Extraction")
@@ -116,30 +121,29 @@ def main():
     processed = 0
     current = 0
     extraction_times = []
+    interrupted = False
     start_time = time.time()
 
-    for _, row in users_df.iterrows():
-        user_id = row["user_id"]
-
-        if is_already_processed(user_id):
-            continue
+    pending = [
+        (row["user_id"], build_prompt(base_prompt, row["interview_transcript"]))
+        for _, row in users_df.iterrows()
+        if not is_already_processed(row["user_id"])
+    ]
 
+    def handle_result(index: int, profile, elapsed: float):
+        """Save one finished extraction as soon as it arrives (keeps runs resumable)."""
+        nonlocal processed, current
+        user_id = pending[index][0]
         current += 1
         log.progress(current, to_process, user_id[:8])
 
         try:
-            transcript = row["interview_transcript"]
-
-            prompt = f"{base_prompt}\n\n--- TRANSCRIPT ---\n{transcript}\n--- END TRANSCRIPT ---"
+            if isinstance(profile, Exception):
+                raise profile
 
-            user_start = time.time()
-            # Extract profile
-            profile = client.extract(prompt, UserProfile)
-            elapsed = time.time() - user_start
             extraction_times.append(elapsed)
-            
             save_user_profile(user_id, profile)
-            
+
             # Log summary
             summary = "Unknown"
             if profile.title and profile.title.two_word_summary:
@@ -148,18 +152,25 @@ def main():
                 occ = profile.demographics.occupation
                 summary = occ.value if hasattr(occ, "value") else occ
 
-            log.detail(f"  → {summary}", f"{elapsed:.1f}s")
+            # Progress redraws are throttled, so the detail line carries the id
+            log.detail(f"  → {user_id[:8]} {summary}", f"{elapsed:.1f}s")
             processed += 1
 
-        except KeyboardInterrupt:
-            print()  # Clear progress line
-            log.warning(f"Interrupted! Run again to resume.")
-            break
-
         except Exception as e:
             errors.append({"user_id": user_id, "error": str(e)})
             log.error(f"{user_id[:8]}: {e}")
 
+    # One continuous pool of concurrent requests; unfinished users are
+    # retried on the next run
+    try:
+        client.extract_many(
+            [prompt for _, prompt in pending], UserProfile, on_result=handle_result
+        )
+    except ExtractionInterrupted:
+        print()  # Clear progress line
+        log.warning("Interrupted! Finished profiles saved; in-flight requests abandoned. Run again to resume.")
+        interrupted = True
+
     # Summary
     if errors:
         error_log = USERS_DIR / "extraction_errors.json"
@@ -171,6 +182,8 @@ def main():
     log.summary(processed=processed, skipped=already_done, errors=len(errors))
     log.info(f"Total time: {total_time:.1f}s (avg {avg_time:.1f}s/user)")
 
+    return EXIT_INTERRUPTED if interrupted else 0
+
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -11,18 +11,18 @@ data-driven personas using:
 Output: JSON files for dashboard consumption
 """
 
-import json
 import traceback
 from datetime import datetime
 from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
+import sklearn
+from joblib import Parallel, delayed
+from scipy.stats import rankdata
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.decomposition import PCA
-from sklearn.preprocessing import QuantileTransformer
-from sklearn.metrics import silhouette_score
-from tqdm import tqdm
+from sklearn.metrics import pairwise_distances, silhouette_score
 
 from config import (
     SESSION_CSV,
@@ -31,13 +31,28 @@ from config import (
     PERSONAS_DIR,
     CLUSTER_CONFIG,
 )
-from utils import Logger
+from utils import Logger, write_json
 
 # Clustering parameters from config
 # Clustering parameters from config
 MIN_CLUSTERS = CLUSTER_CONFIG["min_clusters"]
 MAX_CLUSTERS = CLUSTER_CONFIG["max_clusters"]
 RANDOM_STATE = CLUSTER_CONFIG["random_state"]
+N_INIT = CLUSTER_CONFIG["n_init"]
+MINIBATCH_MIN_SESSIONS = CLUSTER_CONFIG["minibatch_min_sessions"]
+
+# N sessions >> 10 BKMs: 'covariance_eigh' (scikit-learn >= 1.5) solves a 10x10
+# eigenproblem instead of a full SVD of the session matrix
+SKLEARN_VERSION = tuple(int(part) for part in sklearn.__version__.split(".")[:2])
+PCA_SVD_SOLVER = "covariance_eigh" if SKLEARN_VERSION >= (1, 5) else "randomized"
+
+# The k-sweep shares one pairwise distance matrix across all candidate k;
+# above this many sessions the N x N matrix gets too large to keep in memory
+SHARED_DISTANCES_MAX_SESSIONS = 10_000
+
+# Silhouette is O(n^2) and only ranks candidate k: score large datasets on a
+# fixed random sample of this many sessions
+SILHOUETTE_SAMPLE_SIZE = 10_000
 
 
 # FEATURE DESCRIPTORS (Dynamic Naming)
@@ -54,6 +69,10 @@ FEATURE_DESCRIPTORS = {
     "input_ratio": ("Interactive", "high interaction with input forms")
 }
 
+# Action/click categories counted per session for the BKMs
+ACTION_TYPES = ['click', 'input', 'terminate']
+CLICK_TYPES = ['purchase', 'search', 'product_link', 'review', 'filter', 'product_option', 'quantity']
+
 
 # PHASE 1: DATA LOADING AND VALIDATION
 
@@ -61,13 +80,16 @@ def load_datasets(log: Logger) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame
     """Load and validate OPeRA datasets."""
     log.info("Loading datasets...")
     
-    action_cols = [
-        'session_id', 'action_id', 'timestamp', 'action_type', 
-        'click_type', 'input_text', 'rationale', 'products'
-    ]
+    # Only the columns the BKMs need; free-text columns (rationale, products, ...)
+    # dominate parse time and memory but are never used
+    action_dtypes = {
+        'session_id': str,
+        'action_type': 'category',
+        'click_type': 'category',
+    }
     
     df_sessions = pd.read_csv(SESSION_CSV)
-    df_actions = pd.read_csv(ACTION_CSV, usecols=lambda c: c in action_cols)
+    df_actions = pd.read_csv(ACTION_CSV, usecols=list(action_dtypes), dtype=action_dtypes)
     df_users = pd.read_csv(USER_CSV)
     
     log.detail("Sessions", f"{len(df_sessions)} rows")
@@ -105,14 +127,12 @@ def parse_session_timestamps(df_sessions: pd.DataFrame, log: Logger) -> pd.DataF
         df_sessions['end_dt'] - df_sessions['start_dt']
     ).dt.total_seconds().fillna(0).clip(lower=0)
     
-    # Filter to valid timestamps
+    # Filter to valid timestamps and sort by start time for consistent processing
+    # (sort_values already returns a new frame, no extra copy needed)
     valid_mask = df_sessions['start_dt'].notna()
-    df_valid = df_sessions[valid_mask].copy()
+    df_valid = df_sessions[valid_mask].sort_values('start_dt').reset_index(drop=True)
     log.detail("Valid sessions", f"{len(df_valid)}/{len(df_sessions)}")
     
-    # Sort by start time for consistent processing
-    df_valid = df_valid.sort_values('start_dt').reset_index(drop=True)
-    
     # Assign Month (YYYY-MM (Month Name) - sorts correctly)
     df_valid['month'] = df_valid['start_dt'].dt.strftime('%Y-%m (%B)')
     
@@ -125,6 +145,18 @@ def parse_session_timestamps(df_sessions: pd.DataFrame, log: Logger) -> pd.DataF
 
 # PHASE 2: BEHAVIORAL KEY METRICS (BKMs)
 
+def to_lowercase_categorical(values: pd.Series, categories: List[str]) -> pd.Categorical:
+    """Recode a column onto fixed lowercase categories (unknown labels become NaN)."""
+    values = values.astype('category')
+    
+    # Lowercase only the distinct labels, then remap the integer codes;
+    # the trailing -1 maps missing values (code -1) to missing
+    label_codes = pd.Index(categories).get_indexer(values.cat.categories.astype(str).str.lower())
+    label_codes = np.append(label_codes, -1)
+    
+    return pd.Categorical.from_codes(label_codes[values.cat.codes.to_numpy()], categories=categories)
+
+
 def calculate_bkms(df_sessions: pd.DataFrame, df_actions: pd.DataFrame, log: Logger) -> pd.DataFrame:
     """
     Calculate Behavioral Key Metrics for each session.
@@ -143,81 +175,67 @@ def calculate_bkms(df_sessions: pd.DataFrame, df_actions: pd.DataFrame, log: Log
     """
     log.info("Calculating Behavioral Key Metrics...")
     
-    # Group actions by session
-    session_groups = df_actions.groupby('session_id')
+    # Fixed lowercase categories: counting compares int8 codes, not strings
+    action_types = to_lowercase_categorical(df_actions['action_type'], ACTION_TYPES)
+    click_types = to_lowercase_categorical(df_actions['click_type'], CLICK_TYPES)
+    
+    # Per-session count matrices (sessions x types), one groupby pass each
+    session_groups = pd.DataFrame(
+        {'action_type': action_types, 'click_type': click_types}, index=df_actions.index
+    ).groupby(df_actions['session_id'])
+    action_counts = session_groups['action_type'].value_counts().unstack(fill_value=0)
+    click_counts = session_groups['click_type'].value_counts().unstack(fill_value=0)
+    
+    counts = (
+        session_groups.size().rename('total_actions').to_frame()
+        .join(action_counts.reindex(columns=['input'], fill_value=0))
+        .join(click_counts.reindex(columns=CLICK_TYPES, fill_value=0))
+    )
     
-    bkm_records = []
+    # Attach session metadata (first row per session); inner join drops
+    # actions whose session has no valid metadata
+    session_meta = (
+        df_sessions.drop_duplicates('session_id')
+        .set_index('session_id')[['user_id', 'month', 'start_time', 'duration_seconds']]
+    )
+    counts = counts.join(session_meta, how='inner')
     
-    for session_id, group in tqdm(session_groups, desc="Processing sessions"):
-        # Get session metadata
-        session_meta = df_sessions[df_sessions['session_id'] == session_id]
-        if len(session_meta) == 0:
-            continue
-            
-        session_meta = session_meta.iloc[0]
-        
-        # Total actions
-        total_actions = len(group)
-        if total_actions == 0:
-            continue
-        
-        # Duration (from session metadata)
-        duration = session_meta['duration_seconds']
+    total = counts['total_actions']
+    duration = counts['duration_seconds']
+    
+    # Calculate BKMs
+    df_bkm = pd.DataFrame({
+        'session_id': counts.index,
+        'user_id': counts['user_id'],
+        'month': counts['month'],
+        'start_time': counts['start_time'],
         
-        # Action type counts
-        action_types = group['action_type'].fillna('').str.lower()
-        click_types = group['click_type'].fillna('').str.lower()
+        # Engagement Metrics
+        'session_duration_seconds': duration,
+        'action_density': total / duration.clip(lower=1),
+        'total_action_count': total,
         
-        n_clicks = (action_types == 'click').sum()
-        n_inputs = (action_types == 'input').sum()
-        n_terminate = (action_types == 'terminate').sum()
+        # Shopping Intent Metrics
+        'purchase_intent_ratio': counts['purchase'] / total,
+        'search_ratio': counts['search'] / total,
+        'product_exploration_ratio': counts['product_link'] / total,
         
-        # Click type subcategories
-        n_purchase = click_types.isin(['purchase']).sum()
-        n_search = click_types.isin(['search']).sum()
-        n_product_link = click_types.isin(['product_link']).sum()
-        n_review = click_types.isin(['review']).sum()
-        n_filter = click_types.isin(['filter']).sum()
-        n_product_option = click_types.isin(['product_option']).sum()
-        n_quantity = click_types.isin(['quantity']).sum()
+        # Decision-Making Metrics
+        'review_engagement_ratio': counts['review'] / total,
+        'filter_usage_ratio': counts['filter'] / total,
+        'option_selection_ratio': (counts['product_option'] + counts['quantity']) / total,
         
-        # Calculate BKMs
-        bkm = {
-            'session_id': session_id,
-            'user_id': session_meta['user_id'],
-            'month': session_meta['month'],
-            'start_time': session_meta['start_time'],
-            
-            # Engagement Metrics
-            'session_duration_seconds': duration,
-            'action_density': total_actions / max(1, duration),
-            'total_action_count': total_actions,
-            
-            # Shopping Intent Metrics
-            'purchase_intent_ratio': n_purchase / total_actions,
-            'search_ratio': n_search / total_actions,
-            'product_exploration_ratio': n_product_link / total_actions,
-            
-            # Decision-Making Metrics
-            'review_engagement_ratio': n_review / total_actions,
-            'filter_usage_ratio': n_filter / total_actions,
-            'option_selection_ratio': (n_product_option + n_quantity) / total_actions,
-            
-            # Session Outcome
-            'input_ratio': n_inputs / total_actions,
-        }
-        
-        bkm_records.append(bkm)
-    
-    df_bkm = pd.DataFrame(bkm_records)
+        # Session Outcome
+        'input_ratio': counts['input'] / total,
+    }).reset_index(drop=True)
     log.success(f"Computed BKMs for {len(df_bkm)} sessions")
     
     return df_bkm
 
 
-def normalize_bkms(df_bkm: pd.DataFrame, log: Logger) -> Tuple[pd.DataFrame, QuantileTransformer, List[str]]:
-    """Normalize BKM values using Quantile Transformation (Percentile Ranks)."""
-    log.info("Normalizing BKMs (QuantileTransformer)...")
+def normalize_bkms(df_bkm: pd.DataFrame, log: Logger) -> Tuple[pd.DataFrame, List[str]]:
+    """Normalize BKM values to Percentile Ranks (column-wise empirical CDF)."""
+    log.info("Normalizing BKMs (percentile ranks)...")
     
     bkm_columns = [
         'session_duration_seconds', 'action_density', 'total_action_count',
@@ -226,27 +244,57 @@ def normalize_bkms(df_bkm: pd.DataFrame, log: Logger) -> Tuple[pd.DataFrame, Qua
         'input_ratio'
     ]
     
-    # Use Uniform Output (0-1) for maximum visual spread in Radar Charts
-    scaler = QuantileTransformer(output_distribution='uniform', random_state=RANDOM_STATE)
+    # Use Uniform Output (0-1) for maximum visual spread in Radar Charts.
+    # Column-wise empirical CDF, matching a uniform QuantileTransformer:
+    # ties share their average rank, column min/max are pinned to 0/1
+    X = df_bkm[bkm_columns].to_numpy(dtype=float)
+    normed = (rankdata(X, method='average', axis=0) - 1) / max(1, len(X) - 1)
+    normed[X == X.max(axis=0)] = 1.0
+    normed[X == X.min(axis=0)] = 0.0
     
-    df_bkm_norm = df_bkm.copy()
-    df_bkm_norm[bkm_columns] = scaler.fit_transform(df_bkm[bkm_columns])
+    # Only the metadata columns are copied; the BKM columns are replaced anyway
+    df_bkm_norm = df_bkm.drop(columns=bkm_columns)
+    df_bkm_norm[bkm_columns] = normed
     
-    return df_bkm_norm, scaler, bkm_columns
+    return df_bkm_norm, bkm_columns
 
 
 # PHASE 3: CLUSTERING
 
+def make_kmeans(k: int, n_sessions: int) -> KMeans | MiniBatchKMeans:
+    """Create the K-Means estimator for k clusters, mini-batch for large datasets."""
+    if n_sessions >= MINIBATCH_MIN_SESSIONS:
+        return MiniBatchKMeans(n_clusters=k, batch_size=1024, random_state=RANDOM_STATE, n_init=N_INIT)
+    return KMeans(n_clusters=k, random_state=RANDOM_STATE, n_init=N_INIT)
+
+
+def score_cluster_count(X: np.ndarray, distances: np.ndarray, metric: str, k: int) -> float:
+    """Fit K-Means with k clusters and return its silhouette score."""
+    kmeans = make_kmeans(k, len(X))
+    labels = kmeans.fit_predict(X)
+    sample_size = SILHOUETTE_SAMPLE_SIZE if len(X) > SILHOUETTE_SAMPLE_SIZE else None
+    return silhouette_score(distances, labels, metric=metric, sample_size=sample_size, random_state=RANDOM_STATE)
+
+
 def find_optimal_clusters(X: np.ndarray, log: Logger) -> int:
     """Find optimal number of clusters using silhouette score."""
     log.info("Finding optimal cluster count...")
     
-    scores = {}
-    for k in range(MIN_CLUSTERS, MAX_CLUSTERS + 1):
-        kmeans = KMeans(n_clusters=k, random_state=RANDOM_STATE, n_init=10)
-        labels = kmeans.fit_predict(X)
-        score = silhouette_score(X, labels)
-        scores[k] = score
+    # Distances don't depend on k: compute them once when sweeping several k
+    candidates = range(MIN_CLUSTERS, MAX_CLUSTERS + 1)
+    if len(candidates) > 1 and len(X) <= SHARED_DISTANCES_MAX_SESSIONS:
+        distances, metric = pairwise_distances(X), 'precomputed'
+    else:
+        distances, metric = X, 'euclidean'
+    
+    # Candidate k are independent fits: evaluate them in parallel
+    n_jobs = -1 if len(candidates) > 1 else 1
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(score_cluster_count)(X, distances, metric, k) for k in candidates
+    )
+    
+    scores = dict(zip(candidates, results))
+    for k, score in scores.items():
         log.detail(f"k={k}", f"silhouette={score:.4f}")
     
     optimal_k = max(scores, key=scores.get)
@@ -255,17 +303,18 @@ def find_optimal_clusters(X: np.ndarray, log: Logger) -> int:
     return optimal_k
 
 
-def cluster_sessions(df_bkm_norm: pd.DataFrame, bkm_columns: List[str], log: Logger) -> Tuple[pd.DataFrame, KMeans, int]:
+def cluster_sessions(df_bkm_norm: pd.DataFrame, bkm_columns: List[str], log: Logger) -> Tuple[pd.DataFrame, KMeans | MiniBatchKMeans, int]:
     """Perform K-Means clustering on session BKM vectors."""
     log.info("Clustering sessions...")
     
-    X = df_bkm_norm[bkm_columns].values
+    # float32 halves memory traffic; quantile-normalized BKMs need no FP64 precision
+    X = df_bkm_norm[bkm_columns].to_numpy(dtype=np.float32)
     
     # Find optimal k
     optimal_k = find_optimal_clusters(X, log)
     
     # Fit final model
-    kmeans = KMeans(n_clusters=optimal_k, random_state=RANDOM_STATE, n_init=10)
+    kmeans = make_kmeans(optimal_k, len(X))
     df_bkm_norm['cluster_id'] = kmeans.fit_predict(X)
     
     # Report cluster sizes
@@ -285,26 +334,31 @@ def compute_cluster_centroids(df_bkm_norm: pd.DataFrame, bkm_columns: List[str],
     return centroids
 
 
-def apply_pca(df_bkm_norm: pd.DataFrame, centroids: pd.DataFrame, bkm_columns: List[str], log: Logger) -> Tuple[pd.DataFrame, pd.DataFrame, PCA]:
-    """Apply PCA for 2D visualization."""
+def apply_pca(df_bkm_norm: pd.DataFrame, centroids: pd.DataFrame, bkm_columns: List[str], log: Logger) -> Tuple[np.ndarray, pd.DataFrame, PCA]:
+    """Apply PCA for 2D visualization. Session coordinates are returned as an (N, 2) array."""
     log.info("Applying PCA for visualization...")
     
-    pca = PCA(n_components=2, random_state=RANDOM_STATE)
+    pca = PCA(n_components=2, svd_solver=PCA_SVD_SOLVER, random_state=RANDOM_STATE)
     
     # Fit on all sessions
-    X = df_bkm_norm[bkm_columns].values
+    X = df_bkm_norm[bkm_columns].to_numpy(dtype=np.float32)
     X_2d = pca.fit_transform(X)
-    df_bkm_norm['pca_x'] = X_2d[:, 0]
-    df_bkm_norm['pca_y'] = X_2d[:, 1]
     
-    # Transform centroids
-    centroids_2d = pca.transform(centroids[bkm_columns].values)
+    # Centroids are cluster means and PCA is linear, so their projection is
+    # the mean of the already-projected session coordinates per cluster
+    centroids_2d = (
+        pd.DataFrame(X_2d, dtype=float)
+        .groupby(df_bkm_norm['cluster_id'].to_numpy())
+        .mean()
+        .reindex(centroids['cluster_id'])
+        .to_numpy()
+    )
     centroids['pca_x'] = centroids_2d[:, 0]
     centroids['pca_y'] = centroids_2d[:, 1]
     
     log.detail("Explained variance", f"{pca.explained_variance_ratio_.sum():.2%}")
     
-    return df_bkm_norm, centroids, pca
+    return X_2d, centroids, pca
 
 
 # PHASE 4: PERSONA CONSTRUCTION
@@ -314,37 +368,27 @@ def identify_cluster_traits(centroids: pd.DataFrame, df_bkm: pd.DataFrame, bkm_c
     log.info("Identifying cluster traits...")
     
     # Compute overall means and stds
-    overall_mean = df_bkm[bkm_columns].mean()
-    overall_std = df_bkm[bkm_columns].std()
+    overall_mean = df_bkm[bkm_columns].mean().to_numpy()
+    overall_std = df_bkm[bkm_columns].std().to_numpy()
+    
+    # Compute z-scores for all clusters at once (K x D)
+    centroid_values = centroids[bkm_columns].to_numpy()
+    z_matrix = (centroid_values - overall_mean) / (overall_std + 1e-6)
+    
+    # Per-cluster feature order by z-score (stable, so ties keep column order)
+    high_order = np.argsort(-z_matrix, axis=1, kind='stable')
+    low_order = np.argsort(z_matrix, axis=1, kind='stable')
     
     cluster_traits = {}
     
-    for _, row in centroids.iterrows():
-        cluster_id = int(row['cluster_id'])
-        
-        # Compute z-scores for this cluster
-        z_scores = {}
-        high_traits = []
-        low_traits = []
-        
-        for col in bkm_columns:
-            z = (row[col] - overall_mean[col]) / (overall_std[col] + 1e-6)
-            z_scores[col] = z
-            
-            if z > 1.0:
-                high_traits.append((col, z))
-            elif z < -1.0:
-                low_traits.append((col, z))
-        
-        # Sort by absolute z-score
-        high_traits.sort(key=lambda x: x[1], reverse=True)
-        low_traits.sort(key=lambda x: x[1])
+    for i, cluster_id in enumerate(centroids['cluster_id'].astype(int).tolist()):
+        z = z_matrix[i].tolist()
         
         cluster_traits[cluster_id] = {
-            'z_scores': z_scores,
-            'high_traits': high_traits[:3],  # Top 3
-            'low_traits': low_traits[:3],
-            'raw_values': {col: row[col] for col in bkm_columns}
+            'z_scores': dict(zip(bkm_columns, z)),
+            'high_traits': [(bkm_columns[j], z[j]) for j in high_order[i, :3] if z[j] > 1.0],  # Top 3
+            'low_traits': [(bkm_columns[j], z[j]) for j in low_order[i, :3] if z[j] < -1.0],
+            'raw_values': dict(zip(bkm_columns, centroid_values[i].tolist()))
         }
     
     return cluster_traits
@@ -399,24 +443,24 @@ def select_representative_sessions(df_bkm_norm: pd.DataFrame, centroids: pd.Data
     """Select session closest to centroid for each cluster."""
     log.info("Selecting representative sessions...")
     
-    representatives = []
+    # float32 like the clustering itself (see cluster_sessions)
+    X = df_bkm_norm[bkm_columns].to_numpy(dtype=np.float32)
+    cluster_ids = df_bkm_norm['cluster_id'].to_numpy()
     
-    for _, centroid_row in centroids.iterrows():
-        cluster_id = int(centroid_row['cluster_id'])
-        cluster_sessions = df_bkm_norm[df_bkm_norm['cluster_id'] == cluster_id]
-        
-        centroid_vec = centroid_row[bkm_columns].values
-        
-        # Compute distances to centroid
-        distances = np.sqrt(((cluster_sessions[bkm_columns].values - centroid_vec) ** 2).sum(axis=1))
-        
-        min_idx = distances.argmin()
-        representative = cluster_sessions.iloc[min_idx].copy()
-        representative['distance_to_centroid'] = distances[min_idx]
-        
-        representatives.append(representative)
+    # Squared distance from every session to its own centroid in one pass;
+    # centroids are looked up by cluster_id, which need not be contiguous
+    centroid_rows = centroids.set_index('cluster_id')[bkm_columns].loc[cluster_ids]
+    offsets = X - centroid_rows.to_numpy(dtype=np.float32)
+    sq_distances = pd.Series(np.einsum('ij,ij->i', offsets, offsets), index=df_bkm_norm.index)
     
-    return pd.DataFrame(representatives)
+    # Closest session per cluster (argmin of the squared distance, no sqrt needed)
+    rep_indices = sq_distances.groupby(cluster_ids).idxmin()
+    
+    # Materialize the K representative rows once, by index
+    rep_indices = rep_indices.to_numpy()
+    return df_bkm_norm.loc[rep_indices].assign(
+        distance_to_centroid=np.sqrt(sq_distances.loc[rep_indices].to_numpy())
+    )
 
 
 def build_persona_profiles(
@@ -433,13 +477,19 @@ def build_persona_profiles(
     
     personas = []
     
-    for _, centroid_row in centroids.iterrows():
-        cluster_id = int(centroid_row['cluster_id'])
+    # Cluster sizes and representative rows keyed by cluster_id (no per-cluster scans)
+    cluster_sizes = df_bkm_norm['cluster_id'].value_counts().to_dict()
+    reps_by_cluster = representatives.set_index('cluster_id')
+    
+    # Convert the centroid block to native Python values once
+    for cluster_id, pca_x, pca_y, values in zip(
+        centroids['cluster_id'].astype(int).tolist(),
+        centroids['pca_x'].tolist(),
+        centroids['pca_y'].tolist(),
+        centroids[bkm_columns].to_numpy(dtype=float).tolist(),
+    ):
         traits = cluster_traits[cluster_id]
-        rep = representatives[representatives['cluster_id'] == cluster_id].iloc[0]
-        
-        # Get cluster sessions
-        cluster_sessions = df_bkm_norm[df_bkm_norm['cluster_id'] == cluster_id]
+        rep = reps_by_cluster.loc[cluster_id]
         
         # Generate persona name (pass cluster_id for uniqueness)
         name, description = generate_persona_name(traits, cluster_id)
@@ -452,27 +502,27 @@ def build_persona_profiles(
             'cluster_id': cluster_id,
             'name': name,
             'description': description,
-            'session_count': len(cluster_sessions),
+            'session_count': cluster_sizes[cluster_id],
             'centroid': {
-                'pca_x': float(centroid_row['pca_x']),
-                'pca_y': float(centroid_row['pca_y'])
+                'pca_x': pca_x,
+                'pca_y': pca_y
             },
             'behavioral_metrics': {
                 col: {
-                    'value': float(centroid_row[col]),
-                    'z_score': float(traits['z_scores'][col])
+                    'value': value,
+                    'z_score': traits['z_scores'][col]
                 }
-                for col in bkm_columns
+                for col, value in zip(bkm_columns, values)
             },
             'distinguishing_traits': {
-                'high': [{'metric': t[0], 'z_score': float(t[1])} for t in traits['high_traits']],
-                'low': [{'metric': t[0], 'z_score': float(t[1])} for t in traits['low_traits']]
+                'high': [{'metric': t[0], 'z_score': t[1]} for t in traits['high_traits']],
+                'low': [{'metric': t[0], 'z_score': t[1]} for t in traits['low_traits']]
             },
             'representative_session': {
                 'session_id': rep['session_id'],
                 'user_id': user_id,
                 'month': rep['month'],
-                'duration_seconds': float(rep['session_duration_seconds']),
+                'duration_seconds': rep['session_duration_seconds'],
                 'action_count': int(rep['total_action_count'])
             }
         }
@@ -484,78 +534,109 @@ def build_persona_profiles(
 
 # PHASE 5: MONTHLY AGGREGATION
 
-def aggregate_by_month(df_bkm_norm: pd.DataFrame, bkm_columns: List[str], log: Logger) -> Dict:
+def aggregate_by_month(df_bkm_norm: pd.DataFrame, pca_coords: np.ndarray, bkm_columns: List[str], log: Logger) -> Dict:
     """Aggregate cluster data by month with z-scores and traits."""
     log.info("Aggregating by month...")
     
     monthly_data = {}
     
-    for month in df_bkm_norm['month'].unique():
-        month_sessions = df_bkm_norm[df_bkm_norm['month'] == month]
-        
-        # Calculate monthly population statistics
-        monthly_mean = month_sessions[bkm_columns].mean()
-        monthly_std = month_sessions[bkm_columns].std()
-
-        cluster_positions = []
-        for cluster_id in sorted(month_sessions['cluster_id'].unique()):
-            cluster_data = month_sessions[month_sessions['cluster_id'] == cluster_id]
-            
-            # Calculate cluster averages for this month
-            cluster_mean = cluster_data[bkm_columns].mean()
-
-            # Calculate z-scores: (cluster_mean - population_mean) / population_std
-            behavioral_metrics = {}
-            all_z_scores = []  # Track all z-scores for fallback
-
-            for col in bkm_columns:
-                z_score = (cluster_mean[col] - monthly_mean[col]) / (monthly_std[col] + 1e-6)
-                behavioral_metrics[col] = {
-                    'value': float(cluster_mean[col]),
-                    'z_score': float(z_score)
-                }
-                all_z_scores.append({'metric': col, 'z_score': float(z_score)})
-
-            # Identify distinguishing traits (|z| > 0.75)
-            high_traits = [t for t in all_z_scores if t['z_score'] > 0.75]
-            low_traits = [t for t in all_z_scores if t['z_score'] < -0.75]
-
-            # Sort traits by absolute z-score
-            high_traits.sort(key=lambda x: x['z_score'], reverse=True)
-            low_traits.sort(key=lambda x: x['z_score'])
-
-            # Ensure we always show at least top 2 traits, even if below threshold
-            if len(high_traits) < 2:
-                # Get all traits sorted by z-score, take top ones not already in high_traits
-                all_sorted = sorted(all_z_scores, key=lambda x: x['z_score'], reverse=True)
-                for trait in all_sorted:
-                    if trait not in high_traits and len(high_traits) < 2:
-                        high_traits.append(trait)
-
-            if len(low_traits) < 2:
-                # Get all traits sorted by z-score ascending, take bottom ones not already in low_traits
-                all_sorted = sorted(all_z_scores, key=lambda x: x['z_score'])
-                for trait in all_sorted:
-                    if trait not in low_traits and len(low_traits) < 2:
-                        low_traits.append(trait)
-
-            cluster_positions.append({
-                'cluster_id': int(cluster_id),
-                'pca_x': float(cluster_data['pca_x'].mean()),
-                'pca_y': float(cluster_data['pca_y'].mean()),
-                'session_count': len(cluster_data),
-                'behavioral_metrics': behavioral_metrics,
-                'distinguishing_traits': {
-                    'high': high_traits,
-                    'low': low_traits
-                }
-            })
-        
+    # Factorize months once (in order of appearance); integer labels group
+    # much faster than the month strings
+    month_codes, months = pd.factorize(df_bkm_norm['month'])
+    month_codes = pd.Series(month_codes, index=df_bkm_norm.index, name='month')
+    
+    # Calculate monthly population statistics
+    month_groups = df_bkm_norm.groupby(month_codes)
+    monthly_means = month_groups[bkm_columns].mean()
+    monthly_stds = month_groups[bkm_columns].std()
+    month_sizes = month_groups.size()
+    
+    # Calculate all cluster averages per month in a single groupby pass
+    group_keys = [month_codes, df_bkm_norm['cluster_id']]
+    cluster_groups = df_bkm_norm.groupby(group_keys)
+    cluster_means = cluster_groups[bkm_columns].mean()
+    cluster_sizes = cluster_groups.size()
+    
+    # PCA positions per (month, cluster), grouped on a narrow frame of the coordinates
+    cluster_positions_2d = (
+        pd.DataFrame(pca_coords, index=df_bkm_norm.index, columns=['pca_x', 'pca_y'], dtype=float)
+        .groupby(group_keys)
+        .mean()
+    )
+    
+    # Calculate z-scores for every (month, cluster) row at once:
+    # (cluster_mean - population_mean) / population_std
+    cluster_z_scores = (
+        cluster_means[bkm_columns]
+        .sub(monthly_means, level='month')
+        .div(monthly_stds + 1e-6, level='month')
+    )
+    
+    for month, total_sessions in zip(months, month_sizes.tolist()):
         monthly_data[month] = {
-            'total_sessions': len(month_sessions),
-            'clusters': cluster_positions
+            'total_sessions': total_sessions,
+            'clusters': []
         }
     
+    # All (month, cluster) aggregates share the same sorted group index,
+    # so walk them together in a single pass
+    cluster_rows = zip(
+        cluster_means.index.tolist(),
+        cluster_means.to_numpy().tolist(),
+        cluster_z_scores.to_numpy().tolist(),
+        cluster_positions_2d.to_numpy().tolist(),
+        cluster_sizes.tolist(),
+    )
+    
+    for (month_code, cluster_id), values, z_values, (pca_x, pca_y), session_count in cluster_rows:
+        behavioral_metrics = {
+            col: {'value': value, 'z_score': z}
+            for col, value, z in zip(bkm_columns, values, z_values)
+        }
+        # Track all z-scores for fallback
+        all_z_scores = [{'metric': col, 'z_score': z} for col, z in zip(bkm_columns, z_values)]
+
+        # Identify distinguishing traits (|z| > 0.75)
+        high_traits = [t for t in all_z_scores if t['z_score'] > 0.75]
+        low_traits = [t for t in all_z_scores if t['z_score'] < -0.75]
+
+        # Sort traits by absolute z-score
+        high_traits.sort(key=lambda x: x['z_score'], reverse=True)
+        low_traits.sort(key=lambda x: x['z_score'])
+
+        # Ensure we always show at least top 2 traits, even if below threshold
+        if len(high_traits) < 2:
+            # Get all traits sorted by z-score, take top ones not already in high_traits
+            seen = {t['metric'] for t in high_traits}
+            for trait in sorted(all_z_scores, key=lambda x: x['z_score'], reverse=True):
+                if trait['metric'] not in seen:
+                    high_traits.append(trait)
+                    seen.add(trait['metric'])
+                    if len(high_traits) == 2:
+                        break
+
+        if len(low_traits) < 2:
+            # Get all traits sorted by z-score ascending, take bottom ones not already in low_traits
+            seen = {t['metric'] for t in low_traits}
+            for trait in sorted(all_z_scores, key=lambda x: x['z_score']):
+                if trait['metric'] not in seen:
+                    low_traits.append(trait)
+                    seen.add(trait['metric'])
+                    if len(low_traits) == 2:
+                        break
+
+        monthly_data[months[month_code]]['clusters'].append({
+            'cluster_id': cluster_id,
+            'pca_x': pca_x,
+            'pca_y': pca_y,
+            'session_count': session_count,
+            'behavioral_metrics': behavioral_metrics,
+            'distinguishing_traits': {
+                'high': high_traits,
+                'low': low_traits
+            }
+        })
+    
     return monthly_data
 
 
@@ -565,6 +646,7 @@ def generate_output(
     personas: List[Dict],
     monthly_data: Dict,
     df_bkm_norm: pd.DataFrame,
+    pca_coords: np.ndarray,
     df_users: pd.DataFrame,
     bkm_columns: List[str],
     log: Logger
@@ -575,38 +657,43 @@ def generate_output(
     PERSONAS_DIR.mkdir(parents=True, exist_ok=True)
     
     # 1. Personas
-    with open(PERSONAS_DIR / "personas.json", 'w') as f:
-        json.dump(personas, f, indent=2)
+    write_json(PERSONAS_DIR / "personas.json", personas)
     log.success(f"personas.json ({len(personas)} personas)")
     
     # 2. Monthly cluster positions
-    with open(PERSONAS_DIR / "monthly_clusters.json", 'w') as f:
-        json.dump(monthly_data, f, indent=2)
+    write_json(PERSONAS_DIR / "monthly_clusters.json", monthly_data)
     log.success(f"monthly_clusters.json ({len(monthly_data)} months)")
     
     # 3. Session details (for drill-down)
-    session_details = []
-    for _, session in df_bkm_norm.iterrows():
-        session_record = {
-            'session_id': session['session_id'],
-            'user_id': session['user_id'],
-            'month': session['month'],
-            'cluster_id': int(session['cluster_id']),
-            'pca_x': float(session['pca_x']),
-            'pca_y': float(session['pca_y']),
-            'behavioral_metrics': {col: float(session[col]) for col in bkm_columns}
+    # Extract columns once (tolist() yields native Python types) instead of iterrows()
+    session_details = [
+        {
+            'session_id': session_id,
+            'user_id': user_id,
+            'month': month,
+            'cluster_id': cluster_id,
+            'pca_x': pca_x,
+            'pca_y': pca_y,
+            'behavioral_metrics': dict(zip(bkm_columns, metrics))
         }
-        session_details.append(session_record)
+        for session_id, user_id, month, cluster_id, pca_x, pca_y, metrics in zip(
+            df_bkm_norm['session_id'].tolist(),
+            df_bkm_norm['user_id'].tolist(),
+            df_bkm_norm['month'].tolist(),
+            df_bkm_norm['cluster_id'].astype(int).tolist(),
+            pca_coords[:, 0].tolist(),
+            pca_coords[:, 1].tolist(),
+            df_bkm_norm[bkm_columns].to_numpy(dtype=float).tolist(),
+        )
+    ]
     
-    with open(PERSONAS_DIR / "sessions.json", 'w') as f:
-        json.dump(session_details, f, indent=2)
+    # One record per session: the largest output, so it is written without indentation
+    write_json(PERSONAS_DIR / "sessions.json", session_details, indent=False)
     log.success(f"sessions.json ({len(session_details)} sessions)")
     
     # 4. Metadata with fixed PCA bounds
-    pca_x_min = float(df_bkm_norm['pca_x'].min())
-    pca_x_max = float(df_bkm_norm['pca_x'].max())
-    pca_y_min = float(df_bkm_norm['pca_y'].min())
-    pca_y_max = float(df_bkm_norm['pca_y'].max())
+    pca_x_min, pca_y_min = pca_coords.min(axis=0).tolist()
+    pca_x_max, pca_y_max = pca_coords.max(axis=0).tolist()
     
     # Add padding
     x_pad = (pca_x_max - pca_x_min) * 0.1
@@ -626,15 +713,14 @@ def generate_output(
         }
     }
     
-    with open(PERSONAS_DIR / "metadata.json", 'w') as f:
-        json.dump(metadata, f, indent=2)
+    write_json(PERSONAS_DIR / "metadata.json", metadata)
     log.success("metadata.json")
 
 
 # MAIN PIPELINE
 
-def run_pipeline():
-    """Execute the full persona generation pipeline."""
+def run_pipeline() -> int:
+    """Execute the full persona generation pipeline and return an exit code."""
     log = Logger("persona_clustering")
     log.header("Behavioral Persona Generation Pipeline")
     
@@ -647,13 +733,13 @@ def run_pipeline():
         # Phase 2: BKM Calculation
         log.step(2, "Calculating behavioral metrics")
         df_bkm = calculate_bkms(df_sessions, df_actions, log)
-        df_bkm_norm, scaler, bkm_columns = normalize_bkms(df_bkm, log)
+        df_bkm_norm, bkm_columns = normalize_bkms(df_bkm, log)
         
         # Phase 3: Clustering
         log.step(3, "Clustering sessions")
         df_bkm_norm, kmeans, optimal_k = cluster_sessions(df_bkm_norm, bkm_columns, log)
         centroids = compute_cluster_centroids(df_bkm_norm, bkm_columns, log)
-        df_bkm_norm, centroids, pca = apply_pca(df_bkm_norm, centroids, bkm_columns, log)
+        pca_coords, centroids, pca = apply_pca(df_bkm_norm, centroids, bkm_columns, log)
         
         # Phase 4: Persona Construction
         log.step(4, "Constructing personas")
@@ -666,10 +752,10 @@ def run_pipeline():
         
         # Phase 5: Monthly Aggregation
         log.step(5, "Aggregating by month")
-        monthly_data = aggregate_by_month(df_bkm_norm, bkm_columns, log)
+        monthly_data = aggregate_by_month(df_bkm_norm, pca_coords, bkm_columns, log)
 
         # Phase 6: Output
-        generate_output(personas, monthly_data, df_bkm_norm, df_users, bkm_columns, log)
+        generate_output(personas, monthly_data, df_bkm_norm, pca_coords, df_users, bkm_columns, log)
         
         log.summary(
             processed=len(df_bkm_norm),
@@ -679,10 +765,13 @@ def run_pipeline():
         log.info(f"Output: {PERSONAS_DIR}")
         
     except Exception as e:
+        # Reported here, so callers only need the exit code
         log.error(f"Pipeline failed: {e}")
         traceback.print_exc()
-        raise
+        return 1
+    
+    return 0
 
 
 if __name__ == "__main__":
-    run_pipeline()
+    raise SystemExit(run_pipeline())
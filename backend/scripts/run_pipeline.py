@@ -17,47 +17,48 @@ Steps:
 """
 
 import argparse
-import subprocess
-import sys
-from pathlib import Path
+import importlib
+import traceback
 
-from utils import Logger
+from utils import EXIT_INTERRUPTED, Logger
 
-SCRIPT_DIR = Path(__file__).parent
-
-# Define pipeline steps
+# Define pipeline steps: (name, module, entry point, description)
+# Steps run in-process so pandas/sklearn are imported once for the whole run
 CORE_STEPS = [
-    ("download", "download_hf_dataset.py", "Download OPeRA dataset"),
-    ("cluster", "persona_clustering.py", "Generate behavioral personas"),
+    ("download", "download_hf_dataset", "main", "Download OPeRA dataset"),
+    ("cluster", "persona_clustering", "run_pipeline", "Generate behavioral personas"),
 ]
 
 LLM_STEPS = [
-    ("extract", "extract_users.py", "Extract user profiles (LLM)"),
-    ("combine", "combine_users.py", "Combine user profiles"),
-    ("personas", "extract_personas.py", "Generate cluster proto-personas (LLM)"),
+    ("extract", "extract_users", "main", "Extract user profiles (LLM)"),
+    ("combine", "combine_users", "main", "Combine user profiles"),
+    ("personas", "extract_personas", "main", "Generate cluster proto-personas (LLM)"),
 ]
 
 ALL_STEPS = CORE_STEPS + LLM_STEPS
 
 
-def run_script(script_name: str, log: Logger, extra_args: list = None) -> bool:
-    """Run a Python script and return success status."""
-    script_path = SCRIPT_DIR / script_name
-    
-    if not script_path.exists():
-        log.error(f"Script not found: {script_name}")
-        return False
-    
-    cmd = [sys.executable, str(script_path)]
-    if extra_args:
-        cmd.extend(extra_args)
-    
+def run_step(module_name: str, entry_point: str, log: Logger, args: list = None) -> int:
+    """Import a pipeline module, call its entry point and return its exit code."""
     try:
-        result = subprocess.run(cmd, cwd=str(SCRIPT_DIR))
-        return result.returncode == 0
+        # Modules are imported on first use so the core pipeline never loads LLM clients
+        entry = getattr(importlib.import_module(module_name), entry_point)
+        result = entry(args) if args is not None else entry()
+    except SystemExit as e:
+        # argparse and scripts exiting early report their status via SystemExit
+        result = e.code
+    except KeyboardInterrupt:
+        print()
+        return EXIT_INTERRUPTED
     except Exception as e:
-        log.error(f"Failed to run {script_name}: {e}")
-        return False
+        # Steps report their own handled failures via the exit code; this is
+        # only reached for errors nothing else has printed
+        log.error(f"Failed to run {module_name}: {e}")
+        traceback.print_exc()
+        return 1
+    
+    # Entry points return None or an exit code
+    return result if isinstance(result, int) else int(result is not None)
 
 
 def main():
@@ -108,24 +109,31 @@ def main():
     
     # Show plan
     log.step(0, "Execution plan")
-    for i, (name, script, desc) in enumerate(steps, 1):
+    for i, (name, _, _, desc) in enumerate(steps, 1):
         log.info(f"{i}. {name}: {desc}")
     
     # Execute steps
     success = 0
     failed = 0
-    llm_scripts = {"extract_users.py", "extract_personas.py"}
+    interrupted = False
+    llm_modules = {"extract_users", "extract_personas"}
     
-    for i, (name, script, desc) in enumerate(steps, 1):
+    for i, (name, module_name, entry_point, desc) in enumerate(steps, 1):
         log.step(i, desc)
         
-        extra_args = []
-        if script in llm_scripts:
-            extra_args = ["--provider", args.provider]
+        step_args = None
+        if module_name in llm_modules:
+            step_args = ["--provider", args.provider]
         
-        if run_script(script, log, extra_args):
+        exit_code = run_step(module_name, entry_point, log, step_args)
+        if exit_code == 0:
             success += 1
             log.success(f"Completed: {name}")
+        elif exit_code == EXIT_INTERRUPTED:
+            failed += 1
+            log.warning(f"Interrupted: {name} - stopping pipeline")
+            interrupted = True
+            break
         else:
             failed += 1
             log.error(f"Failed: {name}")
@@ -136,6 +144,8 @@ def main():
     # Summary
     log.summary(processed=success, errors=failed)
     
+    if interrupted:
+        return EXIT_INTERRUPTED
     return 0 if failed == 0 else 1
 
 
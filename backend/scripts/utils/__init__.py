@@ -1,7 +1,8 @@
 """Shared utilities for backend scripts."""
 
+from .exit_codes import EXIT_INTERRUPTED
 from .file_helpers import read_file_safe, write_json, load_json
-from .llm_client import LLMClient
+from .llm_client import ExtractionInterrupted, LLMClient
 from .logger import Logger
 
-__all__ = ["read_file_safe", "write_json", "load_json", "LLMClient", "Logger"]
+__all__ = ["EXIT_INTERRUPTED", "read_file_safe", "write_json", "load_json", "ExtractionInterrupted", "LLMClient", "Logger"]
@@ -0,0 +1,7 @@
+"""
+Process exit codes shared by the pipeline scripts.
+"""
+
+# Returned by a step after Ctrl+C (128 + SIGINT, as a shell reports it), so
+# run_pipeline stops instead of moving on to the next step
+EXIT_INTERRUPTED = 130
@@ -2,9 +2,13 @@
 File I/O utilities with robust encoding handling.
 """
 
-import json
 from pathlib import Path
 
+import orjson
+
+# orjson writes numpy scalars/arrays natively; non-str keys are stringified like json.dumps
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
 
 def read_file_safe(file_path: Path) -> str:
     """
@@ -39,16 +43,14 @@ def read_file_safe(file_path: Path) -> str:
         return f.read().decode("utf-8", errors="replace")
 
 
-def write_json(file_path: Path, data: dict | list, indent: int = 2) -> None:
-    """Write data to JSON file with UTF-8 encoding."""
+def write_json(file_path: Path, data: dict | list, indent: bool = True) -> None:
+    """Write data to JSON file with UTF-8 encoding (2-space indent unless disabled)."""
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    file_path.write_text(
-        json.dumps(data, indent=indent, ensure_ascii=False), 
-        encoding="utf-8"
-    )
+    option = (JSON_OPTIONS | orjson.OPT_INDENT_2) if indent else JSON_OPTIONS
+    file_path.write_bytes(orjson.dumps(data, option=option))
 
 
 def load_json(file_path: Path) -> dict | list:
     """Load JSON file with safe encoding."""
     content = read_file_safe(file_path)
-    return json.loads(content)
+    return orjson.loads(content)
@@ -4,7 +4,10 @@ Supports Ollama and OpenAI providers.
 """
 
 import json
-from typing import Type, TypeVar
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Type, TypeVar, Union
 
 import requests
 from pydantic import BaseModel, ValidationError
@@ -15,20 +18,42 @@ from config import (
     OLLAMA_MODEL,
     OPENAI_API_KEY,
     OPENAI_MODEL,
+    LLM_CONCURRENCY,
 )
 from .logger import Logger
 
 T = TypeVar("T", bound=BaseModel)
 
 
+class ExtractionInterrupted(KeyboardInterrupt):
+    """Ctrl+C during extract_many(); carries the results that had already finished."""
+
+    def __init__(self, completed: Dict[int, Union[BaseModel, Exception]]):
+        super().__init__()
+        # Prompt index -> validated model or exception, for finished prompts only
+        self.completed = completed
+
+
 class LLMClient:
     """Unified LLM client with Pydantic response validation."""
 
-    def __init__(self, provider: str = "ollama"):
+    def __init__(self, provider: str = "ollama", concurrency: int = LLM_CONCURRENCY):
         self.provider = provider
+        self.concurrency = max(1, concurrency)
         self.log = Logger("llm_client")
-        if provider == "openai" and not OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY not set in environment")
+        if provider == "openai":
+            if not OPENAI_API_KEY:
+                raise ValueError("OPENAI_API_KEY not set in environment")
+            import openai
+
+            # One client (and connection pool) reused across all calls
+            self._openai = openai.OpenAI(api_key=OPENAI_API_KEY)
+        else:
+            # Persistent session keeps the connection to Ollama alive between calls
+            self._session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.concurrency)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
 
     @property
     def model_name(self) -> str:
@@ -80,9 +105,91 @@ class LLMClient:
                     continue
                 raise ValueError(f"LLM returned invalid JSON: {e}") from e
 
+    def extract_many(
+        self,
+        prompts: List[str],
+        response_model: Type[T],
+        max_retries: int = 2,
+        on_result: Callable[[int, Union[T, Exception], float], None] = None,
+    ) -> List[Union[T, Exception]]:
+        """
+        Run extract() for several prompts concurrently.
+        
+        Requests are I/O bound, so up to `concurrency` of them are kept in
+        flight on worker threads; a worker picks up the next prompt as soon as
+        its request finishes, so one slow request doesn't stall the others.
+        
+        Args:
+            on_result: Called in the calling thread as each prompt finishes,
+                with (prompt index, model instance or exception, seconds the
+                request took). Lets callers save results as they arrive.
+        
+        Returns:
+            One entry per prompt, in order: the validated model instance, or
+            the exception raised for that prompt
+        
+        Raises:
+            ExtractionInterrupted: on Ctrl+C, with the results finished so far
+                (on_result has been called for all of them). Requests still in
+                flight are abandoned rather than awaited.
+        """
+        if not prompts:
+            return []
+
+        pending = queue.Queue()
+        for item in enumerate(prompts):
+            pending.put(item)
+        finished = queue.Queue()
+        stop = threading.Event()
+
+        def worker():
+            while not stop.is_set():
+                try:
+                    index, prompt = pending.get_nowait()
+                except queue.Empty:
+                    return
+                request_start = time.monotonic()
+                try:
+                    result = self.extract(prompt, response_model, max_retries)
+                except Exception as e:
+                    result = e
+                finished.put((index, result, time.monotonic() - request_start))
+
+        # Daemon threads: an abandoned request must not keep the process alive
+        for _ in range(min(self.concurrency, len(prompts))):
+            threading.Thread(target=worker, daemon=True).start()
+
+        completed = {}
+
+        def collect(index, result, elapsed):
+            completed[index] = result
+            if on_result is not None:
+                on_result(index, result, elapsed)
+
+        try:
+            while len(completed) < len(prompts):
+                try:
+                    # Timeout keeps the wait interruptible by Ctrl+C on every platform
+                    item = finished.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                collect(*item)
+        except KeyboardInterrupt:
+            stop.set()
+            # Keep anything that finished while the interrupt was delivered
+            while True:
+                try:
+                    item = finished.get_nowait()
+                except queue.Empty:
+                    break
+                collect(*item)
+            raise ExtractionInterrupted(completed) from None
+
+        return [completed[i] for i in range(len(prompts))]
+
     def _call_ollama(self, prompt: str) -> dict:
         """Call Ollama API."""
-        response = requests.post(
+        response = self._session.post(
             OLLAMA_URL,
             json={
                 "model": OLLAMA_MODEL,
@@ -97,11 +204,7 @@ class LLMClient:
 
     def _call_openai(self, prompt: str) -> dict:
         """Call OpenAI API."""
-        import openai
-
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-
-        response = client.chat.completions.create(
+        response = self._openai.chat.completions.create(
             model=OPENAI_MODEL,
             messages=[
                 {"role": "system", "content": "You are a data extraction expert."},
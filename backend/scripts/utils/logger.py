@@ -2,8 +2,29 @@
 Logging utilities for clear, structured console output.
 """
 
+import atexit
+import os
 import sys
-from datetime import datetime
+import threading
+import time
+from types import MappingProxyType
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Maximum progress bar redraws per second (0 disables throttling)
+PROGRESS_HZ = float(os.getenv("LOGGER_PROGRESS_HZ", "10"))
+_PROGRESS_MIN_INTERVAL_NS = int(1e9 / PROGRESS_HZ) if PROGRESS_HZ > 0 else 0
+
+# Every possible progress bar, indexed by filled width
+_BAR_LEN = 30
+_BARS = tuple("#" * i + "-" * (_BAR_LEN - i) for i in range(_BAR_LEN + 1))
+_PROGRESS_FMT = "\r  [%s] %d/%d (%d%%)%s    "
+_PROGRESS_PLAIN_FMT = "  [%s] %d/%d (%d%%)%s\n"
+
+# Byte versions for writing redraws straight to the stdout file descriptor
+_BARS_B = tuple(bar.encode() for bar in _BARS)
+_PROGRESS_FMT_B = _PROGRESS_FMT.encode()
 
 
 class Colors:
@@ -18,21 +39,94 @@ class Colors:
     ERROR = "\033[31m"     # Red
     STEP = "\033[35m"      # Magenta
     
+    _ATTRS = ("RESET", "BOLD", "DIM", "INFO", "SUCCESS", "WARNING", "ERROR", "STEP")
+    
     @classmethod
     def disable(cls):
         """Disable colors for terminals without ANSI support."""
-        for attr in dir(cls):
-            if not attr.startswith("_") and attr != "disable":
-                setattr(cls, attr, "")
+        for attr in cls._ATTRS:
+            setattr(cls, attr, "")
+        _build_formats()
+    
+    @classmethod
+    def enable(cls):
+        """Restore the default color codes."""
+        for attr, code in _COLOR_DEFAULTS.items():
+            setattr(cls, attr, code)
+        _build_formats()
+
+
+_COLOR_DEFAULTS = MappingProxyType({attr: getattr(Colors, attr) for attr in Colors._ATTRS})
+
+
+def _build_formats():
+    """Bake the current color codes into the message templates."""
+    global _HEADER_FMT, _STEP_FMT, _INFO_FMT, _SUCCESS_FMT, _WARNING_FMT, _ERROR_FMT, _DETAIL_FMT
+    _HEADER_FMT = f"\n{Colors.BOLD}{Colors.INFO}# %s{Colors.RESET}\n\n"
+    _STEP_FMT = f"\n{Colors.STEP}[Step %s]{Colors.RESET} {Colors.BOLD}%s{Colors.RESET}\n"
+    _INFO_FMT = f"  {Colors.INFO}>{Colors.RESET} %s\n"
+    _SUCCESS_FMT = f"  {Colors.SUCCESS}[OK]{Colors.RESET} %s\n"
+    _WARNING_FMT = f"  {Colors.WARNING}[WARN]{Colors.RESET} %s\n"
+    _ERROR_FMT = f"  {Colors.ERROR}[ERR]{Colors.RESET} %s\n"
+    _DETAIL_FMT = f"    {Colors.DIM}%s:{Colors.RESET} %s\n"
+
+
+_build_formats()
+
+
+_ANSI_ENABLED = False
+
+
+def _ensure_ansi():
+    """Enable ANSI escape handling on Windows 10+ (once, on first Logger)."""
+    global _ANSI_ENABLED
+    if _ANSI_ENABLED:
+        return
+    _ANSI_ENABLED = True
+    if sys.platform == "win32":
+        try:
+            os.system("")
+        except:
+            Colors.disable()
+
 
+# Duplicate-line state is shared by every Logger (and thread): they all write
+# to the same stdout, so any logger output ends a run. Writes that bypass the
+# logger (bare print()) can't be seen and may land before the count line
+_last_line = None
+_repeat_count = 1
+_emit_lock = threading.Lock()
 
-# Enable ANSI on Windows 10+
-if sys.platform == "win32":
-    try:
-        import os
-        os.system("")
-    except:
-        Colors.disable()
+
+def _emit(line: str):
+    """Write a log line, collapsing consecutive duplicates into a counter."""
+    global _last_line, _repeat_count
+    with _emit_lock:
+        if line == _last_line:
+            _repeat_count += 1
+            return
+        _end_run_locked()
+        _last_line = line
+        sys.stdout.write(line)
+
+
+def _end_run():
+    """Close the current run of repeated lines before other output is written."""
+    with _emit_lock:
+        _end_run_locked()
+
+
+# Report a pending count even if the script exits (or crashes) mid-run
+atexit.register(_end_run)
+
+
+def _end_run_locked():
+    global _last_line, _repeat_count
+    if _repeat_count > 1:
+        extra = _repeat_count - 1
+        sys.stdout.write(f"    ... repeated {extra} more time{'s' if extra > 1 else ''}\n")
+    _last_line = None
+    _repeat_count = 1
 
 
 class Logger:
@@ -41,54 +135,137 @@ class Logger:
     def __init__(self, script_name: str):
         self.script_name = script_name
         self.start_time = None
+        self._last_progress = None
+        self._last_draw_ns = 0
+        self._last_plain_decile = -1
+        _ensure_ansi()
+        
+        # Redirected output (files, CI logs) gets no ANSI codes and a
+        # line-per-10% progress report instead of a redrawn bar
+        is_tty = sys.stdout.isatty()
+        if not is_tty or os.environ.get("NO_COLOR"):
+            Colors.disable()
+        if not is_tty:
+            self.progress = self._progress_plain
     
     def header(self, title: str):
         """Print script header."""
-        self.start_time = datetime.now()
-        print(f"\n{Colors.BOLD}{Colors.INFO}# {title}{Colors.RESET}\n")
+        if _last_line is not None:
+            _end_run()
+        self.start_time = time.monotonic()
+        sys.stdout.write(_HEADER_FMT % (title,))
+        sys.stdout.flush()
     
     def step(self, number: int, description: str):
         """Print numbered step header."""
-        print(f"\n{Colors.STEP}[Step {number}]{Colors.RESET} {Colors.BOLD}{description}{Colors.RESET}")
+        if _last_line is not None:
+            _end_run()
+        sys.stdout.write(_STEP_FMT % (number, description))
     
     def info(self, message: str):
         """Print info message."""
-        print(f"  {Colors.INFO}>{Colors.RESET} {message}")
+        _emit(_INFO_FMT % (message,))
     
     def success(self, message: str):
         """Print success message."""
-        print(f"  {Colors.SUCCESS}[OK]{Colors.RESET} {message}")
+        _emit(_SUCCESS_FMT % (message,))
     
     def warning(self, message: str):
         """Print warning message."""
-        print(f"  {Colors.WARNING}[WARN]{Colors.RESET} {message}")
+        _emit(_WARNING_FMT % (message,))
     
     def error(self, message: str):
         """Print error message."""
-        print(f"  {Colors.ERROR}[ERR]{Colors.RESET} {message}")
+        _emit(_ERROR_FMT % (message,))
     
     def detail(self, label: str, value):
         """Print indented detail line."""
-        print(f"    {Colors.DIM}{label}:{Colors.RESET} {value}")
+        if _last_line is not None:
+            _end_run()
+        sys.stdout.write(_DETAIL_FMT % (label, value))
     
     def progress(self, current: int, total: int, item: str = ""):
         """Print progress bar."""
-        pct = (current / total * 100) if total > 0 else 0
-        bar_len = 30
-        filled = int(bar_len * current / total) if total > 0 else 0
-        bar = "#" * filled + "-" * (bar_len - filled)
+        # Throttle redraws; the final tick always draws
+        now = time.monotonic_ns()
+        if current < total and now - self._last_draw_ns < _PROGRESS_MIN_INTERVAL_NS:
+            return
+        
+        pct = round(current / total * 100) if total > 0 else 0
+        filled = min(int(_BAR_LEN * current / total), _BAR_LEN) if total > 0 else 0
+        
+        # Skip redraws that wouldn't change the bar, percentage or item
+        key = (filled, pct, item, total)
+        if key == self._last_progress and current < total:
+            return
+        self._last_progress = key
+        self._last_draw_ns = now
+        if _last_line is not None:
+            _end_run()
+        
+        suffix = f" | {item}" if item else ""
+        done = current >= total
+        out = sys.stdout
+        if out is sys.__stdout__:
+            # Unreplaced terminal stdout is line-buffered and empty between log
+            # lines, so the redraw can skip the text layer and its flush
+            line = _PROGRESS_FMT_B % (_BARS_B[filled], current, total, pct, suffix.encode(out.encoding, "replace"))
+            os.write(out.fileno(), line + b"\n" if done else line)
+        else:
+            out.write(_PROGRESS_FMT % (_BARS[filled], current, total, pct, suffix) + ("\n" if done else ""))
+            out.flush()
+        if done:
+            self._last_progress = None
+            self._last_draw_ns = 0
+    
+    def progress_iter(self, iterable: Iterable[T], total: int = None, min_step: int = None) -> Iterator[T]:
+        """
+        Yield items from iterable, updating the progress bar as they are processed.
+        
+        Redraws are batched to every min_step items (default: about 200 redraws
+        in total) plus the final item. total defaults to len(iterable).
+        """
+        if total is None:
+            total = len(iterable)
+        if min_step is None:
+            min_step = max(1, total // 200)
+        
+        for i, item in enumerate(iterable, 1):
+            yield item
+            if i % min_step == 0 or i == total:
+                self.progress(i, total)
+    
+    def _progress_plain(self, current: int, total: int, item: str = ""):
+        """Print a progress line at every 10% boundary, without redrawing."""
+        pct = round(current / total * 100) if total > 0 else 0
+        # Boundaries from the exact fraction; the rounded pct is display-only
+        decile = current * 10 // total if total > 0 else 0
+        if decile == self._last_plain_decile and current < total:
+            return
+        self._last_plain_decile = -1 if current >= total else decile
+        if _last_line is not None:
+            _end_run()
+        
+        filled = min(int(_BAR_LEN * current / total), _BAR_LEN) if total > 0 else 0
         suffix = f" | {item}" if item else ""
-        print(f"\r  [{bar}] {current}/{total} ({pct:.0f}%){suffix}    ", end="", flush=True)
-        if current >= total:
-            print()
+        sys.stdout.write(_PROGRESS_PLAIN_FMT % (_BARS[filled], current, total, pct, suffix))
+        # At most 11 lines per bar: cheap enough to keep CI logs live
+        sys.stdout.flush()
     
     def summary(self, processed: int, skipped: int = 0, errors: int = 0):
         """Print final summary."""
+        if _last_line is not None:
+            _end_run()
         elapsed = ""
-        if self.start_time:
-            delta = datetime.now() - self.start_time
-            mins, secs = divmod(delta.seconds, 60)
-            elapsed = f" ({mins}m {secs}s)" if mins > 0 else f" ({secs}s)"
+        if self.start_time is not None:
+            hours, rem = divmod(int(time.monotonic() - self.start_time), 3600)
+            mins, secs = divmod(rem, 60)
+            if hours:
+                elapsed = f" ({hours}h {mins}m {secs}s)"
+            elif mins:
+                elapsed = f" ({mins}m {secs}s)"
+            else:
+                elapsed = f" ({secs}s)"
         
         print(f"\n{Colors.BOLD}{'-' * 60}{Colors.RESET}")
         print(f"  {Colors.SUCCESS}Processed:{Colors.RESET} {processed}{elapsed}")
@@ -97,3 +274,4 @@ class Logger:
         if errors > 0:
             print(f"  {Colors.ERROR}Errors:{Colors.RESET}    {errors}")
         print()
+        sys.stdout.flush()